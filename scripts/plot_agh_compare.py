@@ -26,17 +26,33 @@ Usage:
 - Optionally set environment variables:
   - HEADLINE_T (default 16)       : thread count for bar/bucket/skew-sweep plots
   - MIX (default "80/20")
+  - PLOT_WORKERS (default: CPU count) : processes used to render figures; 1 renders serially
+  - FORCE=1                         : redraw PNGs even if newer than the input CSVs and this script
+                                      (a change of MIX or HEADLINE_T also forces a redraw)
 """
-import os, warnings
+import csv, glob, hashlib, os, re, warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pac
+import pyarrow.ipc as paipc
 import seaborn as sns
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 warnings.filterwarnings("ignore", category=UserWarning)
+# Copy-on-Write (always on from pandas 3.0): slices share buffers until a column is written
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
 sns.set(context="paper", style="whitegrid", font_scale=1.05)
 plt.rcParams["figure.dpi"] = 140
 plt.rcParams["savefig.bbox"] = "tight"
+# Agg path settings: simplify dense paths and render long ones in chunks
+plt.rcParams["path.simplify"] = True
+plt.rcParams["path.simplify_threshold"] = 1.0
+plt.rcParams["agg.path.chunksize"] = 10000
 
 RESULTS_DIR = "../results"
 OUTDIR = "../results/figs_agh_compare"
@@ -44,16 +60,30 @@ OUTDIR = "../results/figs_agh_compare"
 AGH_FILE = "agh_matrix.csv"
 SEG_FILE = "segment_matrix.csv"
 FINE_FILE = "fine_matrix.csv"
+# A PNG newer than all of these is up to date and is not redrawn (unless FORCE=1)
+CSV_INPUTS = [os.path.join(RESULTS_DIR, f) for f in (SEG_FILE, FINE_FILE, AGH_FILE)]
+# Canonicalized (loaded + normalized + concatenated) frame, cached as Arrow IPC
+CACHE_DIR = os.path.join(RESULTS_DIR, ".cache")
 
 EXPECTED_COLS = {
     "impl","mode","mix","dist","threads","ops","bucket_count",
     "read_ratio","p_hot","time_s","throughput_mops","speedup","seq_baseline_s"
 }
+# Column types pinned at parse time (no post-hoc to_numeric passes). float32 is
+# plenty for plotted ratios/timings; throughput_mops stays float64 because it
+# feeds the reported deltas.
+ARROW_TYPES = {
+    "threads": pa.int32(), "ops": pa.int64(), "bucket_count": pa.int64(),
+    "read_ratio": pa.float32(), "p_hot": pa.float32(), "time_s": pa.float32(),
+    "throughput_mops": pa.float64(), "speedup": pa.float32(), "seq_baseline_s": pa.float32()
+}
+CSV_BLOCK_SIZE = 1 << 20
 IMPL_ALIASES = {
     "Segment": {"Segment","Segment-Padded","SegmentBased","Segment-Based","segment"},
     "Fine": {"Fine","Fine-Grained","PerBucket","fine"},
     "AGH": {"AGH","agh","Agh"}
 }
+ALIAS_TO_CANON = {a: c for c, aliases in IMPL_ALIASES.items() for a in aliases}
 
 # Mapping for display labels (graph legend / axis) ONLY
 LABEL_MAP = {"AGH": "S2Hash"}
@@ -61,44 +91,104 @@ LABEL_MAP = {"AGH": "S2Hash"}
 SKEW_GAIN_THRESHOLD = 0.10     # >= +10% vs Segment on skew mid bucket
 UNIFORM_REG_LIMIT   = -0.05    # >= -5% vs Fine on uniform high bucket
 
+THREADS_RE = re.compile(r"(\d+)")
+
 HEADLINE_T = int(os.getenv("HEADLINE_T", "16"))
 MIX = os.getenv("MIX", "80/20")
+FORCE = os.getenv("FORCE") == "1"
+PLOT_WORKERS = int(os.getenv("PLOT_WORKERS", str(os.cpu_count() or 1)))
+
+# MIX and HEADLINE_T shape figure content but not every filename; the last rendered
+# values are recorded here and a mismatch makes every PNG stale
+PARAMS_STAMP = os.path.join(OUTDIR, ".render_params")
+RENDER_PARAMS = f"MIX={MIX}\nHEADLINE_T={HEADLINE_T}\n"
 
 def ensure_outdir(p): os.makedirs(p, exist_ok=True)
 
+def read_params_stamp():
+    try:
+        with open(PARAMS_STAMP, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+PARAMS_UNCHANGED = read_params_stamp() == RENDER_PARAMS
+
+def fresh(out, inputs=CSV_INPUTS):
+    if FORCE or not PARAMS_UNCHANGED or not os.path.exists(out): return False
+    srcs = [p for p in inputs + [__file__] if os.path.exists(p)]
+    return all(os.path.getmtime(out) >= os.path.getmtime(p) for p in srcs)
+
+def skip_fresh(fname):
+    if fresh(fname):
+        print(f"[skip] {fname} is up to date")
+        return True
+    return False
+
+def reuse_figure(figsize):
+    """Clear and resize one shared Figure instead of allocating a new one per plot."""
+    fig = plt.figure(num="agh_compare")
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig
+
 def normalize_impl(df):
-    df = df.copy()
-    for canonical, aliases in IMPL_ALIASES.items():
-        df.loc[df["impl"].isin(aliases), "impl"] = canonical
+    s = df["impl"].map(ALIAS_TO_CANON)
+    # Categorical over the canonical names: later ==/isin compare int codes
+    df["impl"] = pd.Categorical(s.where(s.notna(), df["impl"]), categories=list(IMPL_ALIASES))
     return df
 
+def read_header(path):
+    with open(path, newline="") as fh:
+        return [h.strip() for h in next(csv.reader(fh), [])]
+
 def load_csv(path, impl_override=None):
     if not os.path.exists(path): return None
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip()
+    # Header names are stripped up front so padded headers ("impl, mode, ...") still
+    # match ARROW_TYPES and get their pinned types
+    names = read_header(path)
+    try:
+        tbl = pac.read_csv(
+            path,
+            read_options=pac.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE,
+                                         column_names=names, skip_rows=1),
+            convert_options=pac.ConvertOptions(column_types=ARROW_TYPES),
+        )
+        df = tbl.to_pandas(types_mapper=pd.ArrowDtype)
+    except pa.ArrowInvalid:
+        # Non-numeric cells in a typed column: coerce them to NaN instead of failing
+        print(f"[warn] Malformed values in {path}; coercing to NaN.")
+        df = pd.read_csv(path, engine="c", names=names, skiprows=1)
+        # Same ArrowDtype schema as the Arrow path so concat keeps typed columns
+        for c in df.columns:
+            if c in ARROW_TYPES:
+                df[c] = pd.to_numeric(df[c], errors="coerce").astype(pd.ArrowDtype(ARROW_TYPES[c]))
+            elif df[c].dtype == object or pd.api.types.is_string_dtype(df[c]):
+                df[c] = df[c].astype(pd.ArrowDtype(pa.string()))
     if not EXPECTED_COLS.issubset(df.columns):
         missing = EXPECTED_COLS - set(df.columns)
         raise SystemExit(f"Bad schema in {path}, missing: {missing}")
-    for c in ["threads","ops","bucket_count"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    for c in ["read_ratio","p_hot","time_s","throughput_mops","speedup","seq_baseline_s"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
     if impl_override:
         df["impl"] = impl_override
     df = normalize_impl(df)
     if df.columns.duplicated().any():
         df = df.loc[:, ~df.columns.duplicated()]
+    # p_hot discretized to hundredths so slices use an int compare, not isclose
+    df["_phot_k"] = (df["p_hot"]*100).round().astype("Int16")
     return df
 
+def phot_key(p_hot):
+    return int(round(p_hot*100))
+
 def pick_skew_ph(df):
-    vals = sorted(set(df.loc[df["dist"]=="skew","p_hot"].dropna()))
+    keys = np.unique(df.loc[df["dist"]=="skew","_phot_k"].dropna().to_numpy(np.int64))
     for pref in [0.90, 0.99, 0.70]:
-        if any(np.isclose(val, pref) for val in vals):
+        if phot_key(pref) in keys:
             return pref
-    return vals[-1] if vals else 0.90
+    return keys[-1] / 100 if keys.size else 0.90
 
 def pick_mid_high_buckets(df):
-    bucks = sorted(set(df["bucket_count"].dropna().astype(int)))
+    bucks = np.unique(df["bucket_count"].dropna().to_numpy(np.int64)).tolist()
     if not bucks:
         raise SystemExit("No bucket counts found.")
     high = bucks[-1]
@@ -106,154 +196,171 @@ def pick_mid_high_buckets(df):
     return mid, high
 
 def sanitize_threads(col):
+    # Typed at parse time; only text columns (e.g. "16T") need the regex pass
+    if pd.api.types.is_numeric_dtype(col):
+        return col
     return (col.astype(str)
-            .str.extract(r"(\d+)", expand=False)
+            .str.extract(THREADS_RE, expand=False)
             .astype(float))
 
-def strong_slice(df, dist, bucket, mix=MIX, p_hot=None):
-    sub = (df["mode"]=="strong") & (df["mix"]==mix) & (df["bucket_count"]==bucket)
-    if dist == "uniform":
-        sub &= (df["dist"]=="uniform")
-    else:
-        sub &= (df["dist"]=="skew")
-        if p_hot is not None:
-            sub &= np.isclose(df["p_hot"], p_hot)
-    out = df[sub].copy()
+def strong_rows(df, mix=MIX):
+    """Strong-scaling rows for one mix, with threads sanitized; every slice below starts from this."""
+    out = df[(df["mode"]=="strong") & (df["mix"]==mix)]
     out["threads"] = sanitize_threads(out["threads"]).astype("Int64")
     out = out.dropna(subset=["threads","throughput_mops"])
     out["threads"] = out["threads"].astype(int)
     return out
 
-def at_T(df, dist, bucket, T=HEADLINE_T, mix=MIX, p_hot=None):
-    sub = strong_slice(df, dist, bucket, mix, p_hot)
-    return sub[sub["threads"]==T].copy()
+def slice_groups(df_s):
+    """Group strong rows by (dist, bucket_count) once; slices are then hashed lookups, not scans."""
+    return df_s.groupby(["dist","bucket_count"], observed=True, sort=False)
+
+def strong_slice(groups, dist, bucket, p_hot=None):
+    dist = "uniform" if dist == "uniform" else "skew"
+    try:
+        sub = groups.get_group((dist, bucket))
+    except KeyError:
+        return groups.obj.iloc[:0]
+    if dist == "skew" and p_hot is not None:
+        sub = sub[sub["_phot_k"]==phot_key(p_hot)]
+    return sub
+
+def at_T(groups, dist, bucket, T=HEADLINE_T, p_hot=None):
+    sub = strong_slice(groups, dist, bucket, p_hot)
+    return sub[sub["threads"]==T]
 
 def recompute_speedup(df_slice):
-    rows = []
-    for impl in sorted(df_slice["impl"].unique()):
-        sub = df_slice[df_slice["impl"]==impl].sort_values("threads")
-        base = sub[sub["threads"]==1]
-        if base.empty:
-            print(f"[warn] Missing 1-thread baseline for {impl} in slice; skipping it for speedup.")
-            continue
-        b_thr = base["throughput_mops"].iloc[0]
-        for r in sub.itertuples():
-            sp = r.throughput_mops / b_thr if b_thr > 0 else np.nan
-            rows.append({"impl":impl, "threads":r.threads, "speedup":sp})
-    return pd.DataFrame(rows)
+    base = (df_slice.loc[df_slice["threads"]==1, ["impl","throughput_mops"]]
+            .drop_duplicates("impl")
+            .rename(columns={"throughput_mops":"_b"}))
+    for impl in sorted(set(df_slice["impl"].dropna()) - set(base["impl"])):
+        print(f"[warn] Missing 1-thread baseline for {impl} in slice; skipping it for speedup.")
+    out = df_slice.merge(base, on="impl", how="inner")
+    thr = out["throughput_mops"].to_numpy(dtype=float, na_value=np.nan)
+    b = out["_b"].to_numpy(dtype=float, na_value=np.nan)
+    out["speedup"] = np.divide(thr, b, out=np.full_like(thr, np.nan), where=b > 0)
+    return out[["impl","threads","speedup"]]
 
 def display_label(impl):
     return LABEL_MAP.get(impl, impl)
 
 def bar_plot_T(sub, title, fname, order=("Fine","Segment","AGH")):
+    if skip_fresh(fname): return
     if sub.empty:
         print(f"[warn] Empty bar slice for {fname}")
         return
     use_order = [x for x in order if x in sub["impl"].unique()]
     # Use underlying impl for order; then relabel x tick text
-    plt.figure(figsize=(6.0,3.4))
+    reuse_figure((6.0,3.4))
     ax = sns.barplot(data=sub, x="impl", y="throughput_mops", order=use_order, palette="tab10")
     ax.set_title(title); ax.set_xlabel(""); ax.set_ylabel("Throughput (Mops/s)")
     # Annotate heights
-    for p in ax.patches:
-        v = p.get_height()
-        ax.annotate(f"{v:.2f}", (p.get_x()+p.get_width()/2., v), ha='center', va='bottom',
-                    fontsize=8, xytext=(0,3), textcoords='offset points')
+    for cont in ax.containers:
+        ax.bar_label(cont, fmt="%.2f", padding=3, fontsize=8)
     # Relabel x-axis ticks
     ax.set_xticklabels([display_label(t.get_text()) for t in ax.get_xticklabels()])
-    plt.tight_layout(); plt.savefig(fname); plt.close(); print(f"[info] Wrote {fname}")
+    plt.tight_layout(); plt.savefig(fname); print(f"[info] Wrote {fname}")
 
 def line_plot_throughput(df_slice, title, fname, order=("Fine","Segment","AGH")):
+    if skip_fresh(fname): return
     if df_slice.empty:
         print(f"[warn] Empty line slice for {fname}")
         return
-    plt.figure(figsize=(6.6,3.6))
+    g = df_slice.sort_values("threads").groupby("impl", sort=False, observed=True)
+    reuse_figure((6.6,3.6))
     for impl in order:
-        sub = df_slice[df_slice["impl"]==impl].sort_values("threads")
-        if sub.empty: continue
-        plt.plot(sub["threads"], sub["throughput_mops"], marker="o", label=display_label(impl))
+        if impl not in g.groups: continue
+        sub = g.get_group(impl)
+        plt.plot(sub["threads"].values, sub["throughput_mops"].values, marker="o", label=display_label(impl))
     plt.title(title); plt.xlabel("Threads"); plt.ylabel("Throughput (Mops/s)")
-    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname); plt.close()
+    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname)
     print(f"[info] Wrote {fname}")
 
 def line_plot_speedup(df_slice, title, fname, order=("Fine","Segment","AGH")):
+    if skip_fresh(fname): return
     sp = recompute_speedup(df_slice)
     if sp.empty:
         print(f"[warn] Empty speedup slice for {fname}")
         return
-    plt.figure(figsize=(6.6,3.6))
+    g = sp.sort_values("threads").groupby("impl", sort=False, observed=True)
+    reuse_figure((6.6,3.6))
     for impl in order:
-        sub = sp[sp["impl"]==impl].sort_values("threads")
-        if sub.empty: continue
-        plt.plot(sub["threads"], sub["speedup"], marker="o", label=display_label(impl))
+        if impl not in g.groups: continue
+        sub = g.get_group(impl)
+        plt.plot(sub["threads"].values, sub["speedup"].values, marker="o", label=display_label(impl))
     plt.title(title); plt.xlabel("Threads"); plt.ylabel("Speedup (×)")
-    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname); plt.close()
+    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname)
     print(f"[info] Wrote {fname}")
 
-def skew_sweep_plot(df_all, bucket, T=HEADLINE_T, mix=MIX, fname="agh_skew_sweep.png", order=("Fine","Segment","AGH")):
-    sub = df_all[(df_all["mode"]=="strong") & (df_all["mix"]==mix) & (df_all["bucket_count"]==bucket) &
-                 (df_all["threads"]==T) & (df_all["dist"]=="skew")].copy()
+def skew_sweep_plot(skew_B, bucket, T=HEADLINE_T, mix=MIX, fname="agh_skew_sweep.png", order=("Fine","Segment","AGH")):
+    if skip_fresh(fname): return
+    sub = skew_B[skew_B["threads"]==T]
     if sub.empty:
         print(f"[warn] Empty skew sweep for B={bucket}, T={T}")
         return
-    plt.figure(figsize=(6.6,3.6))
+    g = sub.sort_values("p_hot").groupby("impl", sort=False, observed=True)
+    reuse_figure((6.6,3.6))
     for impl in order:
-        r = sub[sub["impl"]==impl].sort_values("p_hot")
-        if r.empty: continue
-        plt.plot(r["p_hot"], r["throughput_mops"], marker="o", label=display_label(impl))
+        if impl not in g.groups: continue
+        r = g.get_group(impl)
+        plt.plot(r["p_hot"].values, r["throughput_mops"].values, marker="o", label=display_label(impl))
     plt.title(f"Skew sensitivity (T={T}, B={bucket:,}, mix={mix})")
     plt.xlabel("p_hot"); plt.ylabel("Throughput (Mops/s)")
-    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname); plt.close()
+    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname)
     print(f"[info] Wrote {fname}")
 
 def buckets_scaling_plot(df_all, dist, T=HEADLINE_T, mix=MIX, p_hot=None, fname="agh_buckets.png", order=("Fine","Segment","AGH")):
-    sub = (df_all["mode"]=="strong") & (df_all["mix"]==mix) & (df_all["threads"]==T)
+    if skip_fresh(fname): return
+    sub = (df_all["threads"]==T)
     if dist=="uniform":
         sub &= (df_all["dist"]=="uniform")
     else:
         sub &= (df_all["dist"]=="skew")
         if p_hot is not None:
-            sub &= np.isclose(df_all["p_hot"], p_hot)
-    d = df_all[sub].copy()
+            sub &= (df_all["_phot_k"]==phot_key(p_hot))
+    d = df_all[sub]
     if d.empty:
         print(f"[warn] Empty bucket scaling slice for {dist}, T={T}")
         return
-    plt.figure(figsize=(6.8,3.8))
+    g = d.sort_values("bucket_count").groupby("impl", sort=False, observed=True)
+    reuse_figure((6.8,3.8))
     for impl in order:
-        r = d[d["impl"]==impl].sort_values("bucket_count")
-        if r.empty: continue
-        plt.plot(r["bucket_count"], r["throughput_mops"], marker="o", label=display_label(impl))
+        if impl not in g.groups: continue
+        r = g.get_group(impl)
+        plt.plot(r["bucket_count"].values, r["throughput_mops"].values, marker="o", label=display_label(impl))
     ttl = f"Throughput vs buckets (dist={dist}, T={T}, mix={mix}"
     if dist=="skew" and p_hot is not None: ttl += f", p_hot={p_hot:.2f}"
     ttl += ")"
     plt.title(ttl); plt.xlabel("bucket_count"); plt.ylabel("Throughput (Mops/s)")
-    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname); plt.close()
+    plt.legend(fontsize="small"); plt.tight_layout(); plt.savefig(fname)
     print(f"[info] Wrote {fname}")
 
-def compute_deltas(df_all, midB, highB, skew_ph, T=HEADLINE_T, mix=MIX):
+def run_jobs(jobs):
+    """Render independent figures; each job is (plotter, args, kwargs) and writes its own file."""
+    if PLOT_WORKERS <= 1:
+        for fn, args, kwargs in jobs:
+            fn(*args, **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=min(len(jobs), PLOT_WORKERS)) as ex:
+        futs = [ex.submit(fn, *args, **kwargs) for fn, args, kwargs in jobs]
+        for f in futs:
+            f.result()
+
+def compute_deltas(groups, midB, highB, skew_ph, T=HEADLINE_T):
     rows=[]
-    skewT = at_T(df_all, "skew", midB, T=T, mix=mix, p_hot=skew_ph)
-    if not skewT.empty:
-        def val(impl):
-            s = skewT[skewT["impl"]==impl]["throughput_mops"]
-            return np.nan if s.empty else float(s.mean())
-        agh = val("AGH"); seg = val("Segment"); fin = val("Fine")
-        if not np.isnan(agh):
-            if not np.isnan(seg):
-                rows.append(dict(slice="skew_midB", cmp="AGH vs Segment", delta_pct=(agh-seg)/seg*100.0, agh=agh, base=seg))
-            if not np.isnan(fin):
-                rows.append(dict(slice="skew_midB", cmp="AGH vs Fine", delta_pct=(agh-fin)/fin*100.0, agh=agh, base=fin))
-    uniT = at_T(df_all, "uniform", highB, T=T, mix=mix)
-    if not uniT.empty:
-        def val2(impl):
-            s = uniT[uniT["impl"]==impl]["throughput_mops"]
-            return np.nan if s.empty else float(s.mean())
-        agh = val2("AGH"); seg = val2("Segment"); fin = val2("Fine")
-        if not np.isnan(agh):
-            if not np.isnan(seg):
-                rows.append(dict(slice="uniform_highB", cmp="AGH vs Segment", delta_pct=(agh-seg)/seg*100.0, agh=agh, base=seg))
-            if not np.isnan(fin):
-                rows.append(dict(slice="uniform_highB", cmp="AGH vs Fine", delta_pct=(agh-fin)/fin*100.0, agh=agh, base=fin))
+    slices = [
+        ("skew_midB", at_T(groups, "skew", midB, T=T, p_hot=skew_ph)),
+        ("uniform_highB", at_T(groups, "uniform", highB, T=T)),
+    ]
+    for name, sub in slices:
+        # One groupby per slice instead of a mask scan per impl
+        means = sub.groupby("impl", observed=True)["throughput_mops"].mean().dropna()
+        if "AGH" not in means.index: continue
+        agh = float(means["AGH"])
+        for base_impl in ("Segment", "Fine"):
+            if base_impl not in means.index: continue
+            base = float(means[base_impl])
+            rows.append(dict(slice=name, cmp=f"AGH vs {base_impl}", delta_pct=(agh-base)/base*100.0, agh=agh, base=base))
     return pd.DataFrame(rows)
 
 def decide(delta_df):
@@ -298,83 +405,122 @@ def write_summary(delta_df, include, rationale):
         f.write("\n".join(lines))
     print(f"[info] Wrote {path}")
 
-def main():
-    ensure_outdir(OUTDIR)
+def load_all():
+    for path in CSV_INPUTS:
+        if not os.path.exists(path): raise SystemExit(f"Missing {os.path.basename(path)}")
+    # Keyed on input mtimes (and this script, which defines the canonical form)
+    stamp = "|".join(str(os.path.getmtime(p)) for p in CSV_INPUTS + [__file__])
+    key = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+    cache = os.path.join(CACHE_DIR, f"agh_all.{key}.arrow")
+    if os.path.exists(cache):
+        try:
+            with pa.memory_map(cache) as src:
+                return paipc.open_file(src).read_all().to_pandas()
+        except (pa.ArrowInvalid, OSError):
+            # Truncated/corrupt cache: rebuild it from the CSVs below
+            print(f"[warn] Unreadable cache {cache}; rebuilding.")
+
     seg = load_csv(os.path.join(RESULTS_DIR, SEG_FILE))
     fine = load_csv(os.path.join(RESULTS_DIR, FINE_FILE))
     agh = load_csv(os.path.join(RESULTS_DIR, AGH_FILE), impl_override="AGH")
-    if seg is None: raise SystemExit("Missing segment_matrix.csv")
-    if fine is None: raise SystemExit("Missing fine_matrix.csv")
-    if agh is None: raise SystemExit("Missing agh_matrix.csv")
-
     df = pd.concat([seg, fine, agh], ignore_index=True)
-    df = df[df["impl"].isin(["Segment","Fine","AGH"])].copy()
+    df = df[df["impl"].isin(["Segment","Fine","AGH"])]
+    # Categorize after concat so all three files share one set of categories
+    for c in ("mode","mix","dist"):
+        df[c] = df[c].astype("category")
+
+    ensure_outdir(CACHE_DIR)
+    for old in glob.glob(os.path.join(CACHE_DIR, "agh_all.*.arrow*")):
+        os.remove(old)
+    tbl = pa.Table.from_pandas(df, preserve_index=False)
+    # Written under a temp name and renamed into place, so a killed run never leaves a partial cache
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    with paipc.new_file(tmp, tbl.schema) as writer:
+        writer.write_table(tbl)
+    os.replace(tmp, cache)
+    return df
+
+def main():
+    ensure_outdir(OUTDIR)
+    if not PARAMS_UNCHANGED and os.path.exists(PARAMS_STAMP):
+        # Outputs are about to change parameters; until this run completes none of them may count as fresh
+        os.remove(PARAMS_STAMP)
+    df = load_all()
 
     skew_ph = pick_skew_ph(df)
     midB, highB = pick_mid_high_buckets(df)
+    # Every figure below is a strong-scaling slice at MIX; filter for that once
+    df_s = strong_rows(df, mix=MIX)
+    groups = slice_groups(df_s)
+    jobs = []
 
     # Bars @ T
-    uni_T = at_T(df, "uniform", highB, T=HEADLINE_T, mix=MIX)
-    bar_plot_T(
+    uni_T = at_T(groups, "uniform", highB, T=HEADLINE_T)
+    jobs.append((bar_plot_T, (
         uni_T,
         f"Uniform (mix={MIX}), T={HEADLINE_T}, B={highB:,}",
         os.path.join(OUTDIR, f"agh_bar_uniform_T{HEADLINE_T}_B{highB}.png")
-    )
-    skew_T = at_T(df, "skew", midB, T=HEADLINE_T, mix=MIX, p_hot=skew_ph)
-    bar_plot_T(
+    ), {}))
+    skew_T = at_T(groups, "skew", midB, T=HEADLINE_T, p_hot=skew_ph)
+    jobs.append((bar_plot_T, (
         skew_T,
         f"Skew (p_hot={skew_ph:.2f}, mix={MIX}), T={HEADLINE_T}, B={midB:,}",
         os.path.join(OUTDIR, f"agh_bar_skew_T{HEADLINE_T}_B{midB}.png")
-    )
+    ), {}))
 
     # Throughput vs threads
-    uni_slice = strong_slice(df, "uniform", highB, mix=MIX, p_hot=None)
-    line_plot_throughput(
+    uni_slice = strong_slice(groups, "uniform", highB, p_hot=None)
+    jobs.append((line_plot_throughput, (
         uni_slice,
         f"Throughput vs threads (uniform, B={highB:,}, mix={MIX})",
         os.path.join(OUTDIR, f"agh_threads_uniform_B{highB}.png")
-    )
-    skew_slice = strong_slice(df, "skew", midB, mix=MIX, p_hot=skew_ph)
-    line_plot_throughput(
+    ), {}))
+    skew_slice = strong_slice(groups, "skew", midB, p_hot=skew_ph)
+    jobs.append((line_plot_throughput, (
         skew_slice,
         f"Throughput vs threads (skew p_hot={skew_ph:.2f}, B={midB:,}, mix={MIX})",
         os.path.join(OUTDIR, f"agh_threads_skew_B{midB}.png")
-    )
+    ), {}))
 
     # Speedup vs threads
-    line_plot_speedup(
+    jobs.append((line_plot_speedup, (
         uni_slice,
         f"Speedup vs threads (uniform, B={highB:,}, mix={MIX})",
         os.path.join(OUTDIR, f"agh_speedup_uniform_B{highB}.png")
-    )
-    line_plot_speedup(
+    ), {}))
+    jobs.append((line_plot_speedup, (
         skew_slice,
         f"Speedup vs threads (skew p_hot={skew_ph:.2f}, B={midB:,}, mix={MIX})",
         os.path.join(OUTDIR, f"agh_speedup_skew_B{midB}.png")
-    )
+    ), {}))
 
     # Skew sensitivity sweeps
-    buckets = sorted(set(df["bucket_count"].dropna().astype(int)))
+    buckets = np.unique(df["bucket_count"].dropna().to_numpy(np.int64)).tolist()
     for B in buckets:
-        skew_sweep_plot(
-            df, B, T=HEADLINE_T, mix=MIX,
+        jobs.append((skew_sweep_plot, (strong_slice(groups, "skew", B), B), dict(
+            T=HEADLINE_T, mix=MIX,
             fname=os.path.join(OUTDIR, f"agh_skew_sweep_T{HEADLINE_T}_B{B}.png")
-        )
+        )))
 
     # Bucket scaling
-    buckets_scaling_plot(
-        df, "uniform", T=HEADLINE_T, mix=MIX,
+    jobs.append((buckets_scaling_plot, (df_s, "uniform"), dict(
+        T=HEADLINE_T, mix=MIX,
         fname=os.path.join(OUTDIR, f"agh_buckets_uniform_T{HEADLINE_T}.png")
-    )
-    buckets_scaling_plot(
-        df, "skew", T=HEADLINE_T, mix=MIX, p_hot=skew_ph,
+    )))
+    jobs.append((buckets_scaling_plot, (df_s, "skew"), dict(
+        T=HEADLINE_T, mix=MIX, p_hot=skew_ph,
         fname=os.path.join(OUTDIR, f"agh_buckets_skew_T{HEADLINE_T}_ph{str(skew_ph).replace('.','')}.png")
-    )
+    )))
+
+    run_jobs(jobs)
+    # Recorded only once every figure for these parameters has been written
+    with open(PARAMS_STAMP, "w", encoding="utf-8") as f:
+        f.write(RENDER_PARAMS)
 
     # Deltas and decision
-    delta_df = compute_deltas(df, midB, highB, skew_ph, T=HEADLINE_T, mix=MIX)
+    delta_df = compute_deltas(groups, midB, highB, skew_ph, T=HEADLINE_T)
     delta_csv = os.path.join(OUTDIR, "agh_vs_baselines_delta.csv")
-    delta_df.to_csv(delta_csv, index=False)
+    delta_df.to_csv(delta_csv, index=False, float_format="%.4f", lineterminator="\n")
     print(f"[info] Wrote {delta_csv}")
 
     include, rationale = decide(delta_df)
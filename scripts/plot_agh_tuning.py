@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
-import os, warnings
+import csv, math, os, warnings
 import pandas as pd
 import numpy as np
 import seaborn as sns
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from cycler import cycler
 
 warnings.filterwarnings("ignore", category=UserWarning)
-sns.set(context="paper", style="whitegrid", font_scale=1.05)
-plt.rcParams["figure.dpi"] = 140
-plt.rcParams["savefig.bbox"] = "tight"
+# Theme resolved once into a plain rc dict and applied around the plotting calls
+# in main(), instead of mutating global rcParams at import time
+STYLE = {
+    **sns.axes_style("whitegrid"),
+    **sns.plotting_context("paper", font_scale=1.05),
+    "axes.prop_cycle": cycler(color=sns.color_palette("deep")),
+    "font.family": ["sans-serif"],
+    "figure.dpi": 140,
+    "savefig.bbox": "tight",
+    # Agg path settings: simplify dense paths and render long ones in chunks
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+}
 
 IN_CSV = "../results/agh_tuning/agh_tune.csv"
 OUTDIR = "../results/figs_agh_tuning"
@@ -17,100 +31,137 @@ TARGET_THREADS = 16
 SKEW_PH = 0.90
 SKEW_BUCKET = 262144
 UNIFORM_BUCKET = 1048576
+PH_TOL = 1e-6
+# Fast PNG encode: zlib level 1 and no Software/timestamp metadata
+PNG_SAVE_KW = dict(pil_kwargs={"compress_level": 1, "optimize": False}, metadata={"Software": None})
+
+# Columns the tuning plots use; rows missing a REQUIRED value are dropped
+REQUIRED_COLS = ["threads","bucket_count","throughput_mops"]
+OPTIONAL_COLS = ["S","MAX_STRIPES","STRIPE_FACTOR","p_hot"]
 
 def load():
     if not os.path.exists(IN_CSV):
         raise SystemExit(f"{IN_CSV} not found. Run scripts/tune_agh.sh first.")
-    df = pd.read_csv(IN_CSV)
-    for c in ["threads","bucket_count","throughput_mops","S","MAX_STRIPES","STRIPE_FACTOR","p_hot"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    df = df.dropna(subset=["threads","bucket_count","throughput_mops"])
+    # Small file: one csv.reader pass into preallocated arrays
+    with open(IN_CSV, newline="") as f:
+        n = sum(1 for _ in f) - 1
+        f.seek(0)
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        num_cols = REQUIRED_COLS + [c for c in OPTIONAL_COLS if c in header]
+        pos = [header.index(c) for c in num_cols]
+        dist_pos = header.index("dist")
+        vals = np.full((len(num_cols), n), np.nan)
+        dist = np.empty(n, dtype=object)
+        i = 0
+        for row in reader:
+            try:
+                req = [float(row[p]) for p in pos[:len(REQUIRED_COLS)]]
+            except (ValueError, IndexError):
+                continue
+            # float() accepts a literal "nan"; to_numeric + dropna dropped those rows too
+            if any(map(math.isnan, req)):
+                continue
+            vals[:len(REQUIRED_COLS), i] = req
+            for j in range(len(REQUIRED_COLS), len(pos)):
+                try:
+                    vals[j, i] = float(row[pos[j]])
+                except (ValueError, IndexError):
+                    pass
+            dist[i] = row[dist_pos]
+            i += 1
+    df = pd.DataFrame(dict(zip(num_cols, vals[:, :i])))
+    df["dist"] = dist[:i]
     return df
 
+# Multi-column filters go through DataFrame.query so pandas can fuse them into one
+# numexpr pass when numexpr is installed (plain vectorised evaluation otherwise)
+SKEW_Q = "dist == 'skew' and abs(p_hot - @SKEW_PH) < @PH_TOL and bucket_count == @B"
+UNIFORM_Q = "dist == 'uniform' and bucket_count == @B"
+
 def slice_decision(df):
-    skew = df[(df["dist"]=="skew") &
-              (np.isclose(df["p_hot"], SKEW_PH)) &
-              (df["bucket_count"]==SKEW_BUCKET) &
-              (df["threads"]==TARGET_THREADS)]
-    uni  = df[(df["dist"]=="uniform") &
-              (df["bucket_count"]==UNIFORM_BUCKET) &
-              (df["threads"]==TARGET_THREADS)]
+    T = TARGET_THREADS
+    B = SKEW_BUCKET
+    skew = df.query(SKEW_Q + " and threads == @T")
+    B = UNIFORM_BUCKET
+    uni  = df.query(UNIFORM_Q + " and threads == @T")
     return skew, uni
 
 def aggregate(slice_df):
-    if slice_df.empty: return pd.DataFrame()
     cols = ["S","MAX_STRIPES","STRIPE_FACTOR"]
-    return (slice_df.groupby(cols, as_index=False)["throughput_mops"].mean()
-            .sort_values("throughput_mops", ascending=False))
+    # Empty slices still carry the aggregate columns so callers can index them
+    if slice_df.empty: return pd.DataFrame(columns=cols + ["throughput_mops"])
+    d = slice_df.dropna(subset=cols)
+    S, M, F = (d[c].to_numpy().astype(np.int64) for c in cols)
+    # Pack (S, MAX_STRIPES, STRIPE_FACTOR) into one int64 key (21 bits each) and
+    # reduce with bincount instead of a pandas groupby
+    key = (S << 42) | (M << 21) | F
+    u, inv = np.unique(key, return_inverse=True)
+    means = np.bincount(inv, weights=d["throughput_mops"].to_numpy()) / np.bincount(inv)
+    mask = (1 << 21) - 1
+    out = pd.DataFrame({"S": u >> 42, "MAX_STRIPES": (u >> 21) & mask,
+                        "STRIPE_FACTOR": u & mask, "throughput_mops": means})
+    return out.sort_values("throughput_mops", ascending=False)
 
-def cfg_label(r):
-    return f"S{int(r.S)}-M{int(r.MAX_STRIPES)}-F{int(r.STRIPE_FACTOR)}"
+def cfg_labels(d):
+    # Vectorised "S{S}-M{M}-F{F}" labels, one string concat per column
+    return ("S" + d["S"].astype(int).astype(str) +
+            "-M" + d["MAX_STRIPES"].astype(int).astype(str) +
+            "-F" + d["STRIPE_FACTOR"].astype(int).astype(str))
 
 def plot_combined(skew_agg, uni_agg, out_path):
     if skew_agg.empty and uni_agg.empty:
         print("[warn] No data to plot.")
         return
-    skew_agg = skew_agg.copy(); skew_agg["slice"]="skew"
-    uni_agg  = uni_agg.copy();  uni_agg["slice"]="uniform"
-    merged = pd.concat([skew_agg, uni_agg], ignore_index=True)
-    merged["config"] = merged.apply(cfg_label, axis=1)
-    order = list(skew_agg["S"].astype(int).astype(str) + "-M" + skew_agg["MAX_STRIPES"].astype(int).astype(str) + "-F" + skew_agg["STRIPE_FACTOR"].astype(int).astype(str))
+    merged = pd.concat([skew_agg.assign(slice="skew"), uni_agg.assign(slice="uniform")], ignore_index=True)
+    merged["config"] = cfg_labels(merged)
+    order = list(cfg_labels(skew_agg))
     plt.figure(figsize=(10,4.6))
     ax1 = plt.subplot(1,2,1)
     sns.barplot(data=merged[merged["slice"]=="skew"], x="config", y="throughput_mops", color="#4C78A8", ax=ax1, order=order)
     ax1.set_title(f"Skew (T={TARGET_THREADS}, B={SKEW_BUCKET:,}, p_hot={SKEW_PH})")
     ax1.set_xlabel("Config"); ax1.set_ylabel("Throughput (Mops/s)")
     ax1.tick_params(axis='x', rotation=35)
-    for p in ax1.patches:
-        v = p.get_height()
-        ax1.annotate(f"{v:.2f}", (p.get_x()+p.get_width()/2., v), ha='center', va='bottom', fontsize=7, xytext=(0,2), textcoords='offset points')
+    for cont in ax1.containers:
+        ax1.bar_label(cont, fmt="%.2f", padding=2, fontsize=7)
     ax2 = plt.subplot(1,2,2)
     sns.barplot(data=merged[merged["slice"]=="uniform"], x="config", y="throughput_mops", color="#F58518", ax=ax2, order=order)
     ax2.set_title(f"Uniform (T={TARGET_THREADS}, B={UNIFORM_BUCKET:,})")
     ax2.set_xlabel("Config"); ax2.set_ylabel("Throughput (Mops/s)")
     ax2.tick_params(axis='x', rotation=35)
-    for p in ax2.patches:
-        v = p.get_height()
-        ax2.annotate(f"{v:.2f}", (p.get_x()+p.get_width()/2., v), ha='center', va='bottom', fontsize=7, xytext=(0,2), textcoords='offset points')
+    for cont in ax2.containers:
+        ax2.bar_label(cont, fmt="%.2f", padding=2, fontsize=7)
     plt.tight_layout()
-    plt.savefig(out_path)
+    plt.savefig(out_path, **PNG_SAVE_KW)
     plt.close()
     print(f"[info] Wrote {out_path}")
 
-def plot_scaling(df, topN, out_path):
-    rows=[]
-    top = []
+def plot_scaling(df, skew_agg, topN, out_path):
+    pieces = []
     # Select topN by skew at target slice
-    skew_slice, _ = slice_decision(df)
-    skew_agg = aggregate(skew_slice)
-    for _, r in skew_agg.head(topN).iterrows():
-        top.append((int(r.S), int(r.MAX_STRIPES), int(r.STRIPE_FACTOR)))
+    head = skew_agg.head(topN)
+    top = list(zip(*(head[c].astype(int).tolist() for c in ("S","MAX_STRIPES","STRIPE_FACTOR"))))
     if not top:
         print("[warn] No top configs found for scaling.")
         return
     for (S, M, F) in top:
-        sub = df[(df["S"]==S) & (df["MAX_STRIPES"]==M) & (df["STRIPE_FACTOR"]==F)]
-        for dist, B in [("uniform", UNIFORM_BUCKET), ("skew", SKEW_BUCKET)]:
-            cur = sub[(sub["dist"]==dist) & ((dist=="uniform") | (np.isclose(sub["p_hot"], SKEW_PH))) & (sub["bucket_count"]==B)]
+        sub = df.query("S == @S and MAX_STRIPES == @M and STRIPE_FACTOR == @F")
+        for dist, B, q in [("uniform", UNIFORM_BUCKET, UNIFORM_Q), ("skew", SKEW_BUCKET, SKEW_Q)]:
+            cur = sub.query(q)
             cur = cur.groupby("threads", as_index=False)["throughput_mops"].mean().sort_values("threads")
-            for _, rr in cur.iterrows():
-                rows.append({"config": f"S{S}-M{M}-F{F}", "slice": dist, "threads": int(rr["threads"]), "throughput_mops": rr["throughput_mops"]})
-    plot_df = pd.DataFrame(rows)
+            pieces.append(cur.astype({"threads": int}).assign(config=f"S{S}-M{M}-F{F}", slice=dist))
+    plot_df = pd.concat(pieces, ignore_index=True)
     if plot_df.empty:
         print("[warn] Empty scaling data.")
         return
     plt.figure(figsize=(8.0,4.2))
-    sns.lineplot(data=plot_df, x="threads", y="throughput_mops", hue="config", style="slice", marker="o")
+    sns.lineplot(data=plot_df, x="threads", y="throughput_mops", hue="config", style="slice", marker="o", errorbar=None)
     plt.title("Top AGH configs: throughput vs threads (≤16)")
     plt.xlabel("Threads"); plt.ylabel("Throughput (Mops/s)")
-    plt.tight_layout(); plt.savefig(out_path); plt.close()
+    plt.tight_layout(); plt.savefig(out_path, **PNG_SAVE_KW); plt.close()
     print(f"[info] Wrote {out_path}")
 
-def write_summary(df, out_path):
-    skew_slice, uni_slice = slice_decision(df)
-    skew_agg = aggregate(skew_slice)
-    uni_agg  = aggregate(uni_slice)
+def write_summary(skew_agg, uni_agg, out_path):
     lines = ["# AGH Tuning Summary (threads ≤ 16)"]
     if skew_agg.empty:
         lines.append("No skew decision slice at target threads.")
@@ -138,9 +189,11 @@ def main():
     skew_slice, uni_slice = slice_decision(df)
     skew_agg = aggregate(skew_slice)
     uni_agg  = aggregate(uni_slice)
-    plot_combined(skew_agg, uni_agg, os.path.join(OUTDIR, "agh_combined_T16.png"))
-    plot_scaling(df, topN=3, out_path=os.path.join(OUTDIR, "agh_scaling_le16.png"))
-    write_summary(df, os.path.join(OUTDIR, "agh_summary_T16.md"))
+    with plt.style.context(STYLE):
+        plot_combined(skew_agg, uni_agg, os.path.join(OUTDIR, "agh_combined_T16.png"))
+        # Decision-slice aggregates are computed once and shared by all outputs
+        plot_scaling(df, skew_agg, topN=3, out_path=os.path.join(OUTDIR, "agh_scaling_le16.png"))
+    write_summary(skew_agg, uni_agg, os.path.join(OUTDIR, "agh_summary_T16.md"))
     print("[done] AGH tuning figures written.")
 
 if __name__ == "__main__":
@@ -3,17 +3,29 @@ import os
 import glob
 import math
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Tuple, Dict
 
 import numpy as np
 import pandas as pd
 import seaborn as sns
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pacsv = None
 
 warnings.filterwarnings("ignore", category=UserWarning)
 sns.set(context="paper", style="whitegrid", font_scale=1.1)
 plt.rcParams["figure.dpi"] = 140
 plt.rcParams["savefig.bbox"] = "tight"
+# Agg path settings: simplify dense paths and render long ones in chunks
+plt.rcParams["path.simplify"] = True
+plt.rcParams["path.simplify_threshold"] = 1.0
+plt.rcParams["agg.path.chunksize"] = 10000
 
 RESULTS_DIR = "../results"
 PATTERNS = ["*_matrix.csv", "*matrix.csv"]
@@ -24,28 +36,61 @@ EXPECTED_COLS = {
     "read_ratio","p_hot","time_s","throughput_mops","speedup","seq_baseline_s"
 }
 
+# Numeric schema pinned at parse time (no dtype sniffing, no post-hoc casts).
+# Counts that fit are narrowed; floats stay float64 so p_hot matching and plotted values are exact.
+SCHEMA = {
+    "threads": "int32", "ops": "int64", "bucket_count": "int32",
+    "read_ratio": "float64", "p_hot": "float64", "time_s": "float64",
+    "throughput_mops": "float64", "speedup": "float64", "seq_baseline_s": "float64",
+}
+ARROW_SCHEMA = {c: pa.from_numpy_dtype(np.dtype(t)) for c, t in SCHEMA.items()} if pa else None
+
 # Configuration for headline vs appendix figures
 EXCLUDE_FOR_HEADLINE = {"Coarse", "Coarse-Padded"}  # remove coarse variants from main plots
 LOG_SCALE_FIGS = True
 BROKEN_AXIS_FIG = True
 NORMALIZED_FIGS = True
 FACET_FIGS = True
+# Fast PNG encode: zlib level 1 and no Software/timestamp metadata
+PNG_SAVE_KW = dict(pil_kwargs={"compress_level": 1, "optimize": False}, metadata={"Software": None})
+PLOT_WORKERS = int(os.getenv("PLOT_WORKERS", str(os.cpu_count() or 1)))
+DOWNSAMPLE_ABOVE = 1000  # points per curve before min/max binning kicks in
+DOWNSAMPLE_TO = 500
+IO_WORKERS = 8  # threads for CSV header probes and reads (parsers release the GIL)
 
 def ensure_outdir(path: str):
     os.makedirs(path, exist_ok=True)
 
+def reuse_figure(figsize: Tuple[float, float]):
+    """Clear and resize one shared Figure instead of allocating a new one per plot."""
+    fig = plt.figure(num="plot_matrix")
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig
+
+def read_header(path: str) -> List[str]:
+    # Schema probe only: the header is one plain comma-separated line, no parser needed
+    with open(path, "r", newline="") as fh:
+        return fh.readline().rstrip("\r\n").split(",")
+
+def probe_header(path: str):
+    try:
+        return read_header(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+
 def discover_matrix_csvs() -> List[str]:
     valid, invalid = [], []
-    for pat in PATTERNS:
-        for f in glob.glob(os.path.join(RESULTS_DIR, pat)):
-            try:
-                head = pd.read_csv(f, nrows=1)
-            except Exception:
-                invalid.append((f,"read_error")); continue
-            if EXPECTED_COLS.issubset(set(head.columns)):
-                valid.append(f)
-            else:
-                invalid.append((f,"missing_cols"))
+    candidates = [f for pat in PATTERNS for f in glob.glob(os.path.join(RESULTS_DIR, pat))]
+    with ThreadPoolExecutor(max_workers=max(1, min(IO_WORKERS, len(candidates)))) as ex:
+        headers = list(ex.map(probe_header, candidates))
+    for f, header in zip(candidates, headers):
+        if header is None:
+            invalid.append((f,"read_error"))
+        elif EXPECTED_COLS.issubset(header):
+            valid.append(f)
+        else:
+            invalid.append((f,"missing_cols"))
     if not valid:
         raise SystemExit("No valid matrix CSVs found.")
     if invalid:
@@ -54,48 +99,97 @@ def discover_matrix_csvs() -> List[str]:
     return sorted(valid)
 
 def load_matrix(csvs: List[str]) -> pd.DataFrame:
-    frames = []
-    for f in csvs:
-        df = pd.read_csv(f)
-        for c in ["threads","ops","bucket_count"]:
-            df[c] = df[c].astype(int)
-        for c in ["read_ratio","p_hot","time_s","throughput_mops","speedup","seq_baseline_s"]:
-            df[c] = df[c].astype(float)
-        frames.append(df)
-    df = pd.concat(frames, ignore_index=True).drop_duplicates()
+    if pa is not None:
+        # Typed Arrow tables are chunk-concatenated without copying; one pandas conversion at the end
+        opts = pacsv.ConvertOptions(column_types=ARROW_SCHEMA)
+        read = lambda f: pacsv.read_csv(f, convert_options=opts)
+    else:
+        read = lambda f: pd.read_csv(f, dtype=SCHEMA)
+    # Files are parsed concurrently; map() keeps them in input order
+    with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(csvs))) as ex:
+        parts = list(ex.map(read, csvs))
+    if pa is not None:
+        df = pa.concat_tables(parts, promote_options="default").to_pandas()
+    else:
+        df = pd.concat(parts, ignore_index=True)
+    # Dedupe on one 64-bit hash per row instead of hashing every column's objects
+    h = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    _, keep = np.unique(h, return_index=True)
+    if len(keep) < len(df):
+        df = df.iloc[np.sort(keep)].reset_index(drop=True)
+    # Label columns as categoricals: equality masks and groupbys then work on int codes
+    for c in ("impl","mode","mix","dist"):
+        df[c] = df[c].astype("category")
+    # p_hot rounded once; slices match it with == instead of np.isclose per figure
+    df["ph_round"] = df["p_hot"].round(2)
     return df
 
 def add_avg_chain(df: pd.DataFrame) -> pd.DataFrame:
-    elements = df["ops"] * (1.0 - df["read_ratio"] / 2.0)
-    df = df.copy()
-    df["avg_chain"] = elements / df["bucket_count"]
+    # ops * (1 - read_ratio/2) / bucket_count, built in one float64 buffer; mutates df
+    avg = np.multiply(df["read_ratio"].to_numpy(), -0.5)
+    avg += 1.0
+    avg *= df["ops"].to_numpy()
+    avg /= df["bucket_count"].to_numpy()
+    df["avg_chain"] = avg
     return df
 
 def pick_top_buckets(df: pd.DataFrame) -> Tuple[int, int]:
-    buckets = sorted(df["bucket_count"].unique())
+    buckets = np.unique(df["bucket_count"].to_numpy())  # sorted
     hi = buckets[-1]
     mid = buckets[-2] if len(buckets) > 1 else hi
     return hi, mid
 
 def pick_skew_ph(df: pd.DataFrame) -> float:
-    vals = sorted(set(df.loc[df["dist"]=="skew","p_hot"].round(2)))
+    vals = np.unique(df.loc[df["dist"]=="skew","ph_round"].to_numpy()).tolist()
     for target in [0.90,0.99,0.70]:
         if target in vals: return target
     return float(np.median(vals)) if vals else 0.90
 
-def lineplot(df, x, y, hue, title, fname, xlabel=None, ylabel=None, logy=False):
+def get_slice(gb, key) -> pd.DataFrame:
+    """Rows for one (mode, mix, dist, bucket_count) key, or an empty frame if absent."""
+    try:
+        return gb.get_group(key)
+    except KeyError:
+        return gb.obj.iloc[:0]
+
+def present_impls(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop impl categories with no rows so legends/facets only list plotted impls."""
+    return df.assign(impl=df["impl"].cat.remove_unused_categories())
+
+def downsample_minmax(xs: np.ndarray, ys: np.ndarray, n: int = DOWNSAMPLE_TO):
+    """Keep the min and max point of each of n/2 x-bins (xs sorted) so long curves keep their envelope."""
+    # Missing y values carry no envelope information and would leave all-NaN bins
+    ok = np.isfinite(ys)
+    xs, ys = xs[ok], ys[ok]
+    if len(xs) <= n:
+        return xs, ys
+    edges = np.linspace(xs[0], xs[-1], n // 2 + 1)
+    bins = np.clip(np.searchsorted(edges, xs, side="right") - 1, 0, n // 2 - 1)
+    g = pd.Series(ys).groupby(bins)
+    keep = np.unique(np.concatenate([g.idxmin().to_numpy(), g.idxmax().to_numpy()]))
+    return xs[keep], ys[keep]
+
+def lineplot(df, x, y, hue, title, fname, xlabel=None, ylabel=None, logy=False, ylim=None):
+    """Single-axes line figure; every hue-per-impl line plot in this script renders through here."""
     if df.empty: return
-    plt.figure(figsize=(6.3,3.9))
-    ax = sns.lineplot(data=df, x=x, y=y, hue=hue, marker="o")
+    df = present_impls(df)
+    ax = reuse_figure((6.3,3.9)).add_subplot()
+    # One (impl, threads) row per point, so plain ax.plot per hue group is all seaborn would draw
+    for name, sub in df.sort_values(x).groupby(hue, sort=True, observed=True):
+        xs, ys = sub[x].to_numpy(), sub[y].to_numpy()
+        if len(xs) > DOWNSAMPLE_ABOVE:
+            xs, ys = downsample_minmax(xs, ys)
+        ax.plot(xs, ys, marker="o", mec="w", mew=0.75, label=str(name), rasterized=True)
     ax.set_title(title)
     ax.set_xlabel(xlabel or x)
     ax.set_ylabel(ylabel or y)
     if logy:
         ax.set_yscale("log")
-    if ax.legend_: ax.legend(loc="best", fontsize="small")
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    ax.legend(loc="best", fontsize="small")
     plt.tight_layout()
-    plt.savefig(fname)
-    plt.close()
+    plt.savefig(fname, **PNG_SAVE_KW)
 
 def lineplot_broken_axis(df, x, y, hue, title, fname, lower_max, upper_min):
     """
@@ -104,10 +198,12 @@ def lineplot_broken_axis(df, x, y, hue, title, fname, lower_max, upper_min):
     upper_min: lower bound of upper subplot
     """
     if df.empty: return
+    df = present_impls(df)
     impls = sorted(df[hue].unique())
     fig, (ax_low, ax_high) = plt.subplots(2,1,sharex=True, figsize=(6.3,4.8), gridspec_kw={'height_ratios':[1,2]})
-    sns.lineplot(data=df, x=x, y=y, hue=hue, marker="o", ax=ax_low, legend=False)
-    sns.lineplot(data=df, x=x, y=y, hue=hue, marker="o", ax=ax_high)
+    # Data lines are rasterized (axes/text stay vector) should these ever be saved as PDF/SVG
+    sns.lineplot(data=df, x=x, y=y, hue=hue, marker="o", errorbar=None, ax=ax_low, legend=False, rasterized=True)
+    sns.lineplot(data=df, x=x, y=y, hue=hue, marker="o", errorbar=None, ax=ax_high, rasterized=True)
     ax_low.set_ylim(0, lower_max)
     ax_high.set_ylim(upper_min, df[y].max()*1.05)
     ax_low.spines['bottom'].set_visible(False)
@@ -125,150 +221,161 @@ def lineplot_broken_axis(df, x, y, hue, title, fname, lower_max, upper_min):
     ax_high.set_ylabel("Throughput (Mops/s)")
     ax_high.legend(loc="best", fontsize="small")
     plt.tight_layout()
-    plt.savefig(fname)
+    plt.savefig(fname, **PNG_SAVE_KW)
     plt.close()
 
+def facet_line(data, x, y, color=None, **kws):
+    """FacetGrid panel body: one impl per panel, so draw its points directly without seaborn's estimator."""
+    data = data.sort_values(x)
+    plt.gca().plot(data[x].to_numpy(), data[y].to_numpy(), color=color, marker="o", mec="w", mew=0.75,
+                   rasterized=True)
+
 def facet_plot(df, fname, title):
     if df.empty: return
+    df = present_impls(df)
     g = sns.FacetGrid(df, col="impl", col_wrap=3, sharey=False, height=3.0)
-    g.map_dataframe(sns.lineplot, x="threads", y="throughput_mops", marker="o")
+    g.map_dataframe(facet_line, x="threads", y="throughput_mops")
     g.set_axis_labels("Threads", "Mops/s")
     g.fig.subplots_adjust(top=0.87)
     g.fig.suptitle(title)
-    plt.savefig(fname)
+    plt.savefig(fname, **PNG_SAVE_KW)
     plt.close()
 
 def normalized_plot(df, fname, title):
     if df.empty: return
-    # Normalize throughput to max per thread across impls
-    df = df.copy()
-    max_per_thread = df.groupby("threads")["throughput_mops"].transform("max")
-    df["norm_throughput"] = df["throughput_mops"] / max_per_thread
-    plt.figure(figsize=(6.3,3.9))
-    ax = sns.lineplot(data=df, x="threads", y="norm_throughput", hue="impl", marker="o")
-    ax.set_title(title)
-    ax.set_xlabel("Threads")
-    ax.set_ylabel("Normalized throughput (fraction of per-thread max)")
-    ax.set_ylim(0,1.05)
-    if ax.legend_: ax.legend(loc="best", fontsize="small")
-    plt.tight_layout()
-    plt.savefig(fname)
-    plt.close()
+    df = present_impls(df)
+    # Normalize throughput to max per thread across impls (present_impls already returned a new frame)
+    thr = df["throughput_mops"].to_numpy()
+    _, inv = np.unique(df["threads"].to_numpy(), return_inverse=True)
+    max_per_thread = np.full(inv.max() + 1, -np.inf)
+    np.fmax.at(max_per_thread, inv, thr)  # fmax skips NaN like groupby max
+    df["norm_throughput"] = thr / max_per_thread[inv]
+    lineplot(df, "threads", "norm_throughput", "impl", title, fname, xlabel="Threads",
+             ylabel="Normalized throughput (fraction of per-thread max)", ylim=(0,1.05))
 
 def efficiency_plot(df, fname, title):
-    if df.empty: return
-    # Scaling efficiency = speedup / threads
-    df = df.copy()
-    df["efficiency"] = df["speedup"] / df["threads"]
-    plt.figure(figsize=(6.3,3.9))
-    ax = sns.lineplot(data=df, x="threads", y="efficiency", hue="impl", marker="o")
-    ax.set_title(title)
-    ax.set_xlabel("Threads")
-    ax.set_ylabel("Scaling efficiency (speedup / threads)")
-    ax.set_ylim(0,1.1)
-    if ax.legend_: ax.legend(loc="best", fontsize="small")
-    plt.tight_layout()
-    plt.savefig(fname)
-    plt.close()
+    lineplot(df, "threads", "efficiency", "impl", title, fname, xlabel="Threads",
+             ylabel="Scaling efficiency (speedup / threads)", ylim=(0,1.1))
+
+def run_jobs(jobs):
+    """Render independent figures; each job is (plotter, args, kwargs) and writes its own file."""
+    if PLOT_WORKERS <= 1:
+        for fn, args, kwargs in jobs:
+            fn(*args, **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=min(len(jobs), PLOT_WORKERS)) as ex:
+        futs = [ex.submit(fn, *args, **kwargs) for fn, args, kwargs in jobs]
+        for f in futs:
+            f.result()
 
 def main():
     print("[info] Loading matrix CSVs.")
     csvs = discover_matrix_csvs()
     df = load_matrix(csvs)
     df = add_avg_chain(df)
+    # Scaling efficiency = speedup / threads, derived once for every slice that plots it
+    df["efficiency"] = df["speedup"] / df["threads"]
+    # Headline membership evaluated once on the impl category codes; slices carry the mask with them
+    cats = df["impl"].cat.categories
+    excl_codes = [cats.get_loc(x) for x in EXCLUDE_FOR_HEADLINE if x in cats]
+    df["headline"] = ~np.isin(df["impl"].cat.codes.to_numpy(), excl_codes)
 
     ensure_outdir(OUTDIR)
-    mix80 = "80/20" if "80/20" in df["mix"].unique() else sorted(df["mix"].unique())[0]
+    # Slice parameters are picked once up front and passed down; each is a single column scan
+    mixes = sorted(df["mix"].unique())
+    mix80 = "80/20" if "80/20" in mixes else mixes[0]
     hiB, midB = pick_top_buckets(df)
     skew_ph = pick_skew_ph(df)
+    # One hashing pass; every figure slice below is a group lookup instead of a row scan
+    gb = df.groupby(["mode","mix","dist","bucket_count"], sort=False, observed=True)
+    # Figures are independent: collect (plotter, args, kwargs) and render them in a process pool
+    jobs = []
 
     # Strong scaling uniform (FULL including coarse)
-    strong_full = df[(df["mode"]=="strong") & (df["mix"]==mix80) & (df["dist"]=="uniform") & (df["bucket_count"]==hiB)]
-    lineplot(strong_full, "threads", "throughput_mops", "impl",
-             f"Strong scaling (uniform, {mix80}, B={hiB:,})",
-             os.path.join(OUTDIR,"fig1_strong_uniform_all.png"))
+    strong_full = get_slice(gb, ("strong", mix80, "uniform", hiB))
+    jobs.append((lineplot, (strong_full, "threads", "throughput_mops", "impl",
+                            f"Strong scaling (uniform, {mix80}, B={hiB:,})",
+                            os.path.join(OUTDIR,"fig1_strong_uniform_all.png")), {}))
 
     # Headline variant excluding coarse
-    strong_headline = strong_full[~strong_full["impl"].isin(EXCLUDE_FOR_HEADLINE)]
-    lineplot(strong_headline, "threads", "throughput_mops", "impl",
-             f"Strong scaling (uniform, {mix80}, B={hiB:,}) [no coarse]",
-             os.path.join(OUTDIR,"fig1_strong_uniform_headline.png"))
+    strong_headline = strong_full[strong_full["headline"]]
+    jobs.append((lineplot, (strong_headline, "threads", "throughput_mops", "impl",
+                            f"Strong scaling (uniform, {mix80}, B={hiB:,}) [no coarse]",
+                            os.path.join(OUTDIR,"fig1_strong_uniform_headline.png")), {}))
 
     # Optional log-scale
     if LOG_SCALE_FIGS:
-        lineplot(strong_full, "threads", "throughput_mops", "impl",
-                 f"Strong scaling (uniform, log y) B={hiB:,}",
-                 os.path.join(OUTDIR,"fig1_strong_uniform_log.png"),
-                 logy=True)
+        jobs.append((lineplot, (strong_full, "threads", "throughput_mops", "impl",
+                                f"Strong scaling (uniform, log y) B={hiB:,}",
+                                os.path.join(OUTDIR,"fig1_strong_uniform_log.png")), dict(logy=True)))
 
     # Optional broken axis (choose thresholds heuristically)
     if BROKEN_AXIS_FIG and not strong_full.empty:
         low_max = strong_full["throughput_mops"].quantile(0.25) * 1.2
         high_min = strong_full["throughput_mops"].median() * 0.9
-        lineplot_broken_axis(strong_full, "threads", "throughput_mops", "impl",
-                             f"Strong scaling broken axis (uniform, {mix80}, B={hiB:,})",
-                             os.path.join(OUTDIR,"fig1_strong_uniform_broken.png"),
-                             lower_max=low_max, upper_min=high_min)
+        jobs.append((lineplot_broken_axis, (strong_full, "threads", "throughput_mops", "impl",
+                                            f"Strong scaling broken axis (uniform, {mix80}, B={hiB:,})",
+                                            os.path.join(OUTDIR,"fig1_strong_uniform_broken.png")),
+                     dict(lower_max=low_max, upper_min=high_min)))
 
     # Skew strong scaling (full + headline)
-    skew_full = df[(df["mode"]=="strong") & (df["mix"]==mix80) & (df["dist"]=="skew") &
-                   (df["bucket_count"]==hiB) & (np.isclose(df["p_hot"], skew_ph))]
-    lineplot(skew_full, "threads", "throughput_mops", "impl",
-             f"Strong scaling (skew p_hot={skew_ph:.2f}, B={hiB:,})",
-             os.path.join(OUTDIR,"fig2_strong_skew_all.png"))
-    skew_headline = skew_full[~skew_full["impl"].isin(EXCLUDE_FOR_HEADLINE)]
-    lineplot(skew_headline, "threads", "throughput_mops", "impl",
-             f"Strong scaling (skew p_hot={skew_ph:.2f}, B={hiB:,}) [no coarse]",
-             os.path.join(OUTDIR,"fig2_strong_skew_headline.png"))
+    skew_full = get_slice(gb, ("strong", mix80, "skew", hiB))
+    skew_full = skew_full[skew_full["ph_round"] == round(skew_ph, 2)]
+    jobs.append((lineplot, (skew_full, "threads", "throughput_mops", "impl",
+                            f"Strong scaling (skew p_hot={skew_ph:.2f}, B={hiB:,})",
+                            os.path.join(OUTDIR,"fig2_strong_skew_all.png")), {}))
+    skew_headline = skew_full[skew_full["headline"]]
+    jobs.append((lineplot, (skew_headline, "threads", "throughput_mops", "impl",
+                            f"Strong scaling (skew p_hot={skew_ph:.2f}, B={hiB:,}) [no coarse]",
+                            os.path.join(OUTDIR,"fig2_strong_skew_headline.png")), {}))
     if LOG_SCALE_FIGS:
-        lineplot(skew_full, "threads", "throughput_mops", "impl",
-                 f"Strong scaling skew (log y) p_hot={skew_ph:.2f}",
-                 os.path.join(OUTDIR,"fig2_strong_skew_log.png"),
-                 logy=True)
+        jobs.append((lineplot, (skew_full, "threads", "throughput_mops", "impl",
+                                f"Strong scaling skew (log y) p_hot={skew_ph:.2f}",
+                                os.path.join(OUTDIR,"fig2_strong_skew_log.png")), dict(logy=True)))
 
     # Weak scaling uniform
-    weak_full = df[(df["mode"]=="weak") & (df["mix"]==mix80) & (df["dist"]=="uniform") & (df["bucket_count"]==hiB)]
-    lineplot(weak_full, "threads", "throughput_mops", "impl",
-             f"Weak scaling (uniform, {mix80}, B={hiB:,})",
-             os.path.join(OUTDIR,"fig3_weak_uniform_all.png"))
-    weak_headline = weak_full[~weak_full["impl"].isin(EXCLUDE_FOR_HEADLINE)]
-    lineplot(weak_headline, "threads", "throughput_mops", "impl",
-             f"Weak scaling (uniform, {mix80}, B={hiB:,}) [no coarse]",
-             os.path.join(OUTDIR,"fig3_weak_uniform_headline.png"))
+    weak_full = get_slice(gb, ("weak", mix80, "uniform", hiB))
+    jobs.append((lineplot, (weak_full, "threads", "throughput_mops", "impl",
+                            f"Weak scaling (uniform, {mix80}, B={hiB:,})",
+                            os.path.join(OUTDIR,"fig3_weak_uniform_all.png")), {}))
+    weak_headline = weak_full[weak_full["headline"]]
+    jobs.append((lineplot, (weak_headline, "threads", "throughput_mops", "impl",
+                            f"Weak scaling (uniform, {mix80}, B={hiB:,}) [no coarse]",
+                            os.path.join(OUTDIR,"fig3_weak_uniform_headline.png")), {}))
     if LOG_SCALE_FIGS:
-        lineplot(weak_full, "threads", "throughput_mops", "impl",
-                 f"Weak scaling (uniform, log y) B={hiB:,}",
-                 os.path.join(OUTDIR,"fig3_weak_uniform_log.png"),
-                 logy=True)
+        jobs.append((lineplot, (weak_full, "threads", "throughput_mops", "impl",
+                                f"Weak scaling (uniform, log y) B={hiB:,}",
+                                os.path.join(OUTDIR,"fig3_weak_uniform_log.png")), dict(logy=True)))
 
     # Efficiency plots (include Coarse to show scaling inefficiency starkly)
-    efficiency_plot(strong_full, os.path.join(OUTDIR,"fig_efficiency_strong_uniform.png"),
-                    f"Scaling efficiency (uniform, B={hiB:,})")
-    efficiency_plot(skew_full, os.path.join(OUTDIR,"fig_efficiency_strong_skew.png"),
-                    f"Scaling efficiency (skew p_hot={skew_ph:.2f}, B={hiB:,})")
+    jobs.append((efficiency_plot, (strong_full, os.path.join(OUTDIR,"fig_efficiency_strong_uniform.png"),
+                                   f"Scaling efficiency (uniform, B={hiB:,})"), {}))
+    jobs.append((efficiency_plot, (skew_full, os.path.join(OUTDIR,"fig_efficiency_strong_skew.png"),
+                                   f"Scaling efficiency (skew p_hot={skew_ph:.2f}, B={hiB:,})"), {}))
 
     # Normalized throughput (show relative position without axis compression)
     if NORMALIZED_FIGS:
-        normalized_plot(strong_full, os.path.join(OUTDIR,"fig_norm_strong_uniform.png"),
-                        f"Normalized strong scaling (uniform, B={hiB:,})")
-        normalized_plot(skew_full, os.path.join(OUTDIR,"fig_norm_strong_skew.png"),
-                        f"Normalized strong scaling (skew p_hot={skew_ph:.2f})")
+        jobs.append((normalized_plot, (strong_full, os.path.join(OUTDIR,"fig_norm_strong_uniform.png"),
+                                       f"Normalized strong scaling (uniform, B={hiB:,})"), {}))
+        jobs.append((normalized_plot, (skew_full, os.path.join(OUTDIR,"fig_norm_strong_skew.png"),
+                                       f"Normalized strong scaling (skew p_hot={skew_ph:.2f})"), {}))
 
     # Facet small multiples (each impl its own scale)
     if FACET_FIGS:
-        facet_plot(strong_full, os.path.join(OUTDIR,"fig_facet_strong_uniform.png"),
-                   f"Strong scaling facets (uniform, B={hiB:,})")
-        facet_plot(skew_full, os.path.join(OUTDIR,"fig_facet_strong_skew.png"),
-                   f"Strong scaling facets (skew p_hot={skew_ph:.2f}, B={hiB:,})")
+        jobs.append((facet_plot, (strong_full, os.path.join(OUTDIR,"fig_facet_strong_uniform.png"),
+                                  f"Strong scaling facets (uniform, B={hiB:,})"), {}))
+        jobs.append((facet_plot, (skew_full, os.path.join(OUTDIR,"fig_facet_strong_skew.png"),
+                                  f"Strong scaling facets (skew p_hot={skew_ph:.2f}, B={hiB:,})"), {}))
 
     # Speedup plot (already normalized per config baseline)
-    lineplot(strong_full, "threads", "speedup", "impl",
-             f"Speedup vs threads (uniform, B={hiB:,})",
-             os.path.join(OUTDIR,"fig_speedup_strong_uniform_all.png"))
-    lineplot(strong_headline, "threads", "speedup", "impl",
-             f"Speedup vs threads (uniform, B={hiB:,}) [no coarse]",
-             os.path.join(OUTDIR,"fig_speedup_strong_uniform_headline.png"))
+    jobs.append((lineplot, (strong_full, "threads", "speedup", "impl",
+                            f"Speedup vs threads (uniform, B={hiB:,})",
+                            os.path.join(OUTDIR,"fig_speedup_strong_uniform_all.png")), {}))
+    jobs.append((lineplot, (strong_headline, "threads", "speedup", "impl",
+                            f"Speedup vs threads (uniform, B={hiB:,}) [no coarse]",
+                            os.path.join(OUTDIR,"fig_speedup_strong_uniform_headline.png")), {}))
 
+    run_jobs(jobs)
     print(f"[done] Figures written to {OUTDIR}/")
 
 if __name__ == "__main__":
@@ -1,40 +1,51 @@
 #!/usr/bin/env python3
 import os
-import glob
+from pathlib import Path
 import pandas as pd
 import seaborn as sns
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 sns.set(context="paper", style="whitegrid", font_scale=1.1)
 plt.rcParams["figure.dpi"] = 140
 plt.rcParams["savefig.bbox"] = "tight"
+# Agg path settings: simplify dense paths and render long ones in chunks
+plt.rcParams["path.simplify"] = True
+plt.rcParams["path.simplify_threshold"] = 1.0
+plt.rcParams["agg.path.chunksize"] = 10000
+
+RESULTS_DIR = "../results"
 
 def ensure_outdir(path: str):
     os.makedirs(path, exist_ok=True)
 
+def reuse_figure(figsize):
+    """Clear and resize one shared Figure instead of allocating a new one per plot."""
+    fig = plt.figure(num="plot_segments_sweep")
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig
+
 def find_file(default_paths, must_exist=True):
     for p in default_paths:
         if os.path.exists(p):
             return p
-    # fallback: search recursively
-    for pattern in ["**/summary.csv", "**/avg_report.csv"]:
-        for f in glob.glob(pattern, recursive=True):
-            if os.path.exists(f):
-                return f
+    # fallback: search the results tree only, stopping at the first hit
+    for name in ["summary.csv", "avg_report.csv"]:
+        for f in Path(RESULTS_DIR).rglob(name):
+            return str(f)
     if must_exist:
         raise SystemExit(f"Could not find any of: {default_paths}")
     return ""
 
 def read_summary(path: str) -> pd.DataFrame:
     df = pd.read_csv(path)
-    # Normalize S column ("S256" -> 256)
-    def to_int_s(x):
-        s = str(x)
-        return int(s[1:]) if s.startswith("S") else int(s)
-    df["S"] = df["S"].apply(to_int_s)
-    # Types
-    df["threads"] = df["threads"].astype(int)
-    df["bucket_count"] = df["bucket_count"].astype(int)
+    # Normalize S column ("S256" -> 256) with vectorised string ops
+    df["S"] = pd.to_numeric(df["S"].astype(str).str.removeprefix("S"), downcast="integer")
+    # Types (thread and bucket counts fit comfortably in int32)
+    df["threads"] = df["threads"].astype("int32")
+    df["bucket_count"] = df["bucket_count"].astype("int32")
     df["throughput_mops"] = df["throughput_mops"].astype(float)
     return df
 
@@ -49,12 +60,15 @@ def compute_avg_from_summary(summary: pd.DataFrame) -> pd.DataFrame:
     ].copy()
     if sl.empty:
         raise SystemExit("Filtered slice is empty. Ensure your summary.csv matches the sweep script’s filters.")
-    avg = sl.groupby("S", as_index=False)["throughput_mops"].mean().rename(columns={"throughput_mops":"avg_throughput_mops"})
-    uni = sl[sl["dist"]=="uniform"].groupby("S", as_index=False)["throughput_mops"].mean().rename(columns={"throughput_mops":"avg_uniform_mops"})
-    skew = sl[sl["dist"]=="skew"].groupby("S", as_index=False)["throughput_mops"].mean().rename(columns={"throughput_mops":"avg_skew_mops"})
-    out = avg.merge(uni, on="S", how="left").merge(skew, on="S", how="left")
-    out["rows_count"] = sl.groupby("S")["throughput_mops"].count().values
-    return out
+    # Per-S series share the S index, so the frame is assembled by index alignment (no merges)
+    by_s = sl.groupby("S")["throughput_mops"]
+    out = pd.DataFrame({
+        "avg_throughput_mops": by_s.mean(),
+        "avg_uniform_mops": sl[sl["dist"]=="uniform"].groupby("S")["throughput_mops"].mean(),
+        "avg_skew_mops": sl[sl["dist"]=="skew"].groupby("S")["throughput_mops"].mean(),
+        "rows_count": by_s.count(),
+    })
+    return out.reset_index()
 
 def plot_overall_avg(df_avg: pd.DataFrame, outdir: str):
     best_idx = df_avg["avg_throughput_mops"].idxmax()
@@ -62,20 +76,20 @@ def plot_overall_avg(df_avg: pd.DataFrame, outdir: str):
     best_S = int(best_row["S"])
     best_val = float(best_row["avg_throughput_mops"])
 
-    plt.figure(figsize=(6.3, 3.9))
-    ax = sns.barplot(data=df_avg.sort_values("S"), x="S", y="avg_throughput_mops", color="#4C78A8")
+    df_sorted = df_avg.sort_values("S")  # sorted once for both the bars and the annotation
+    reuse_figure((6.3, 3.9))
+    ax = sns.barplot(data=df_sorted, x="S", y="avg_throughput_mops", color="#4C78A8")
     ax.set_title(f"Average throughput vs segments (chosen S={best_S}, ~{best_val:.2f} Mops/s)")
     ax.set_xlabel("Number of segments (S)")
     ax.set_ylabel("Average throughput (Mops/s)")
     # annotate chosen bar
-    xs = list(df_avg.sort_values("S")["S"])
+    xs = df_sorted["S"].tolist()
     xpos = xs.index(best_S)
     ax.annotate("chosen", xy=(xpos, best_val), xytext=(0, 10),
                 textcoords="offset points", ha="center", va="bottom",
                 fontsize=9, color="crimson")
     plt.tight_layout()
     plt.savefig(os.path.join(outdir, "seg_overall_avg.png"))
-    plt.close()
     return best_S, best_val
 
 def slice_and_plot(summary: pd.DataFrame, outdir: str):
@@ -94,15 +108,15 @@ def slice_and_plot(summary: pd.DataFrame, outdir: str):
                     df = df[abs(df["p_hot"] - 0.90) < 1e-9]
                 if df.empty:
                     continue
+                # groupby emits S in ascending order, so no extra sort is needed
                 g = df.groupby("S", as_index=False)["throughput_mops"].mean()
-                plt.figure(figsize=(6.3, 3.4))
-                ax = sns.lineplot(data=g.sort_values("S"), x="S", y="throughput_mops", marker="o", color="#4C78A8")
+                reuse_figure((6.3, 3.4))
+                ax = sns.lineplot(data=g, x="S", y="throughput_mops", marker="o", errorbar=None, color="#4C78A8")
                 ax.set_title(f"Throughput vs segments (dist={dist}, T={T}, B={B:,}, avg over mixes)")
                 ax.set_xlabel("Number of segments (S)")
                 ax.set_ylabel("Throughput (Mops/s)")
                 plt.tight_layout()
                 plt.savefig(os.path.join(outdir, f"seg_curve_{dist}_T{T}_B{B}.png"))
-                plt.close()
 
 def main():
     outdir = "../results/segments/figs_segments"